@@ -0,0 +1,191 @@
+"""
+Bootstrap Confidence Bands for Polling Averages
+===============================================
+
+Computes daily and rolling candidate averages with percentile bootstrap
+bands. Polls are resampled within each day by drawing whole matrices of
+resample indices per batch of replicates, so there are no per-replicate
+Python loops. Each batch has its own seeded RNG stream, which lets
+batches run in separate processes while giving identical results.
+"""
+
+import pandas as pd
+import numpy as np
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, Optional
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+BAND_COLUMNS = [
+    "n_polls",
+    "avg_pct",
+    "avg_pct_lower",
+    "avg_pct_upper",
+    "rolling_n_polls",
+    "rolling_avg_pct",
+    "rolling_avg_pct_lower",
+    "rolling_avg_pct_upper",
+]
+
+
+def compute_average_bands(
+    df: pd.DataFrame,
+    group_columns: Optional[List[str]] = None,
+    n_replicates: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    window_days: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Compute daily and rolling averages with bootstrap confidence bands.
+
+    Args:
+        df: DataFrame with end_date, pct and the group columns
+        group_columns: Columns defining one average series (default from Config)
+        n_replicates: Number of bootstrap replicates (default from Config)
+        n_jobs: Worker processes for the replicates (default from Config)
+        window_days: Rolling window length in days (default from Config)
+
+    Returns:
+        One row per group x poll day with avg_pct, rolling_avg_pct and
+        their _lower/_upper band columns. Bands resting on a single poll
+        (n_polls or rolling_n_polls of 1) would have zero width, so they
+        are left missing instead.
+    """
+    if group_columns is None:
+        group_columns = Config.AVERAGE_GROUP_COLUMNS
+    if n_replicates is None:
+        n_replicates = Config.BOOTSTRAP_REPLICATES
+    if n_jobs is None:
+        n_jobs = Config.BOOTSTRAP_N_JOBS
+    if window_days is None:
+        window_days = Config.ROLLING_WINDOW_DAYS
+    if n_replicates < 1:
+        raise ValueError(f"n_replicates must be at least 1, got {n_replicates}")
+    if n_jobs < 1:
+        raise ValueError(f"n_jobs must be at least 1, got {n_jobs}")
+
+    logger.info(
+        "Computing bootstrap bands with %d replicates",
+        n_replicates,
+        extra={"stage": "bootstrap_bands", "rows": len(df)},
+    )
+
+    # Sort polls so each group x day cell is a contiguous block
+    data = df.loc[df["pct"].notna() & df["end_date"].notna(), group_columns].copy()
+    data["date"] = df["end_date"].dt.normalize()
+    data["pct"] = df["pct"].astype(float)
+    data = data.sort_values(group_columns + ["date"], kind="stable")
+    keys = group_columns + ["date"]
+
+    daily = (
+        data.groupby(keys, sort=True, dropna=False, observed=True)["pct"]
+        .agg(n_polls="size", avg_pct="mean")
+        .reset_index()
+    )
+    if daily.empty:
+        return pd.DataFrame(columns=keys + BAND_COLUMNS)
+
+    values = data["pct"].to_numpy()
+    sizes = daily["n_polls"].to_numpy()
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    window_starts = _rolling_window_starts(daily, group_columns, window_days)
+
+    # Point estimate of the rolling average pools all polls in the window
+    daily_sums = daily["avg_pct"].to_numpy() * sizes
+    window_sizes = _window_totals(sizes, window_starts)
+    daily["rolling_n_polls"] = window_sizes.astype(int)
+    daily["rolling_avg_pct"] = _window_totals(daily_sums, window_starts) / window_sizes
+
+    replicate_sums = _draw_replicate_sums(values, starts, sizes, n_replicates, n_jobs)
+    replicate_daily = replicate_sums / sizes
+    replicate_rolling = _window_totals(replicate_sums, window_starts) / window_sizes
+
+    alpha = 1 - Config.CONFIDENCE_LEVEL
+    percentiles = [100 * alpha / 2, 100 * (1 - alpha / 2)]
+    daily["avg_pct_lower"], daily["avg_pct_upper"] = np.percentile(
+        replicate_daily, percentiles, axis=0
+    )
+    daily["rolling_avg_pct_lower"], daily["rolling_avg_pct_upper"] = np.percentile(
+        replicate_rolling, percentiles, axis=0
+    )
+
+    # Resampling one poll always returns that poll: no real uncertainty estimate
+    single_day = daily["n_polls"] < 2
+    single_window = daily["rolling_n_polls"] < 2
+    daily.loc[single_day, ["avg_pct_lower", "avg_pct_upper"]] = np.nan
+    daily.loc[single_window, ["rolling_avg_pct_lower", "rolling_avg_pct_upper"]] = (
+        np.nan
+    )
+
+    logger.info(
+        "Computed bootstrap bands for %d daily averages",
+        len(daily),
+        extra={"stage": "bootstrap_bands", "rows": len(daily)},
+    )
+
+    return daily[keys + BAND_COLUMNS]
+
+
+def _rolling_window_starts(daily, group_columns, window_days):
+    """Index of the first daily row inside each row's trailing window."""
+    series_codes = daily.groupby(
+        group_columns, sort=False, dropna=False, observed=True
+    ).ngroup()
+    day_numbers = (daily["date"] - daily["date"].min()).dt.days.to_numpy()
+
+    # Space series apart by more than a window so one searchsorted covers all
+    span = day_numbers.max() + window_days + 1
+    keys = series_codes.to_numpy() * span + day_numbers
+    return np.searchsorted(keys, keys - (window_days - 1), side="left")
+
+
+def _window_totals(values, window_starts):
+    """Sum values (along the last axis) over each row's trailing window."""
+    values = np.asarray(values, dtype=float)
+    pad = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    cumulative = np.pad(np.cumsum(values, axis=-1), pad)
+    return cumulative[..., 1:] - cumulative[..., window_starts]
+
+
+def _draw_replicate_sums(values, starts, sizes, n_replicates, n_jobs):
+    """Draw all replicates in batches, optionally across worker processes."""
+    batch_size = Config.BOOTSTRAP_BATCH_SIZE
+    batch_sizes = [
+        min(batch_size, n_replicates - offset)
+        for offset in range(0, n_replicates, batch_size)
+    ]
+
+    # One independent child stream per batch keeps results independent of n_jobs
+    seeds = np.random.SeedSequence(Config.BOOTSTRAP_SEED).spawn(len(batch_sizes))
+    draw_batch = partial(_bootstrap_cell_sums, values, starts, sizes)
+
+    if n_jobs > 1:
+        logger.debug(
+            "Splitting %d batches across %d processes", len(batch_sizes), n_jobs
+        )
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            batches = list(executor.map(draw_batch, batch_sizes, seeds))
+    else:
+        batches = [draw_batch(n, seed) for n, seed in zip(batch_sizes, seeds)]
+
+    return np.vstack(batches)
+
+
+def _bootstrap_cell_sums(values, starts, sizes, n_replicates, seed):
+    """
+    Resample polls within each cell for a batch of replicates.
+
+    Returns:
+        Array of shape (n_replicates, n_cells) with resampled cell sums
+    """
+    rng = np.random.default_rng(seed)
+    row_starts = np.repeat(starts, sizes)
+    row_sizes = np.repeat(sizes, sizes)
+
+    # Each row draws a replacement from its own cell: start + U[0, size)
+    offsets = rng.integers(0, row_sizes, size=(n_replicates, len(values)))
+    resampled = values[row_starts + offsets]
+    return np.add.reduceat(resampled, starts, axis=1)
@@ -26,7 +26,7 @@ def clean_dates(df: pd.DataFrame) -> pd.DataFrame:
 
     for col in Config.DATE_COLUMNS:
         if col in df.columns:
-            logger.info(f"Processing date column: {col}")
+            logger.info("Processing date column: %s", col)
 
             parsed_successfully = False
 
@@ -37,7 +37,7 @@ def clean_dates(df: pd.DataFrame) -> pd.DataFrame:
                         df[col], format=date_format, errors="raise"
                     )
                     logger.info(
-                        f"Successfully parsed {col} using format: {date_format}"
+                        "Successfully parsed %s using format: %s", col, date_format
                     )
                     parsed_successfully = True
                     break
@@ -47,7 +47,7 @@ def clean_dates(df: pd.DataFrame) -> pd.DataFrame:
             # If no format worked, fall back to automatic parsing (with warning suppression)
             if not parsed_successfully:
                 logger.info(
-                    f"No single format worked for {col}, using flexible parsing"
+                    "No single format worked for %s, using flexible parsing", col
                 )
                 # Suppress the warning since we're intentionally using flexible parsing
                 with warnings.catch_warnings():
@@ -85,14 +85,20 @@ def filter_main_candidates(df: pd.DataFrame, apply_filter: bool = True) -> pd.Da
         df = df[df["candidate_name"].isin(Config.MAIN_CANDIDATES)]
 
     kept_rows = len(df)
-    logger.info(f"Candidate filtering: kept {kept_rows:,} of {initial_rows:,} rows")
-
-    # Show candidate distribution
-    if "candidate_name" in df.columns and len(df) > 0:
-        candidate_counts = df["candidate_name"].value_counts()
-        logger.info("Final candidate distribution:")
-        for candidate, count in candidate_counts.items():
-            logger.info(f"  {candidate}: {count:,} polls")
+    logger.info(
+        "Candidate filtering: kept %d of %d rows",
+        kept_rows,
+        initial_rows,
+        extra={"stage": "filter_candidates", "rows": kept_rows},
+    )
+
+    # Show candidate distribution (extra pass over the column, debug only)
+    if logger.isEnabledFor(logging.DEBUG):
+        if "candidate_name" in df.columns and len(df) > 0:
+            candidate_counts = df["candidate_name"].value_counts()
+            logger.debug("Final candidate distribution:")
+            for candidate, count in candidate_counts.items():
+                logger.debug("  %s: %d polls", candidate, count)
 
     return df
 
@@ -104,22 +110,34 @@ def basic_data_quality_check(df: pd.DataFrame) -> None:
     Args:
         df: DataFrame to analyze
     """
-    logger.info("Running basic data quality check")
+    # Validity percentages are informational; skip their column scans if
+    # nobody will see them. The invalid-pct warning below always runs.
+    report_info = logger.isEnabledFor(logging.INFO)
+    if report_info:
+        logger.info("Running basic data quality check")
 
     for col in Config.REQUIRED_COLUMNS:
         if col in df.columns:
-            total = len(df)
-            missing = df[col].isnull().sum()
-            valid = total - missing
+            if report_info:
+                total = len(df)
+                missing = df[col].isnull().sum()
+                valid = total - missing
 
-            logger.info(f"{col}: {valid:,}/{total:,} valid ({valid/total*100:.1f}%)")
+                logger.info(
+                    "%s: %d/%d valid (%.1f%%)",
+                    col,
+                    valid,
+                    total,
+                    valid / total * 100,
+                    extra={"stage": "quality_check", "rows": total},
+                )
 
             # Additional checks for specific columns
             if col == "pct":
                 invalid_pct = df[(df[col] < 0) | (df[col] > 100)].shape[0]
                 if invalid_pct > 0:
                     logger.warning(
-                        f"  {invalid_pct} invalid percentages (outside 0-100%)"
+                        "  %d invalid percentages (outside 0-100%%)", invalid_pct
                     )
 
 
@@ -150,8 +168,10 @@ def simple_cleaning_pipeline(
     final_rows = len(df)
 
     logger.info("Simple cleaning complete:")
-    logger.info(f"  Input: {initial_rows:,} rows")
-    logger.info(f"  Output: {final_rows:,} rows")
+    logger.info("  Input: %d rows", initial_rows)
+    logger.info(
+        "  Output: %d rows", final_rows, extra={"stage": "cleaning", "rows": final_rows}
+    )
 
     return df
 
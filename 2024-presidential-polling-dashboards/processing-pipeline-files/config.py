@@ -61,3 +61,98 @@ class Config:
 
     # Confidence levels for MOE calculations
     CONFIDENCE_LEVEL = 0.95
+
+    # Pollster house-effect model (pct ~ period trend + pollster effect)
+    HOUSE_EFFECT_TREND_FREQ = "W"  # Period used for the shared date trend
+    HOUSE_EFFECT_DAMPING = 1.0  # Ridge damping; shrinks sparsely-observed pollsters
+    HOUSE_EFFECT_FIXED_DAMPING = 0.01  # Much weaker damping for trend/state effects
+    HOUSE_EFFECT_MAX_ITER = 1000  # Iteration cap for the LSQR solver
+    POLL_ID_COLUMN = "poll_id"  # Counts distinct polls per pollster
+
+    # Polling averages and bootstrap confidence bands
+    # One average series per group; keep national and state polls apart
+    AVERAGE_GROUP_COLUMNS = ["candidate_name", "geographic_scope"]
+    ROLLING_WINDOW_DAYS = 7
+    BOOTSTRAP_REPLICATES = 1000  # Main runtime knob for the bootstrap
+    BOOTSTRAP_BATCH_SIZE = 50  # Replicates drawn per NumPy batch (bounds memory)
+    BOOTSTRAP_N_JOBS = 1  # Worker processes; >1 splits batches across processes
+    BOOTSTRAP_SEED = 2024
+
+    # Polling volatility indicators (incremental Welford state)
+    VOLATILITY_GROUP_COLUMNS = ["candidate_name", "geographic_scope"]
+    VOLATILITY_WINDOWS_DAYS = [7, 14]
+    VOLATILITY_LOOKBACK_DAYS = (
+        30  # How late a poll may be published and still be picked up
+    )
+
+    # Head-to-head margins within each poll question
+    QUESTION_ID_COLUMNS = ["question_id"]  # Identifies one poll question
+    QUESTION_FALLBACK_COLUMNS = ["pollster", "start_date", "end_date", "sample_size"]
+    QUESTION_CONTEXT_COLUMNS = [  # Carried onto the per-question table
+        "poll_id",
+        "pollster",
+        "start_date",
+        "end_date",
+        "state",
+        "geographic_scope",
+        "population_clean",
+        "methodology_clean",
+        "sample_size",
+    ]
+    HEAD_TO_HEAD_CANDIDATES = MAIN_CANDIDATES  # Named opponents for margin columns
+    CANDIDATE_PARTIES = {
+        "Donald Trump": "REP",
+        "Joe Biden": "DEM",
+        "Kamala Harris": "DEM",
+    }
+
+    # State x candidate nowcast grid (exponentially decayed weighted averages)
+    NOWCAST_HALF_LIFE_DAYS = 14  # Days for a poll's weight to halve
+    NOWCAST_NATIONAL_LABEL = "National"  # State label for polls without a state
+    NOWCAST_DECIMALS = 2  # Rounding for the saved grid
+
+    # Fixed, ordered category lists for derived label columns
+    CATEGORY_ORDERS = {
+        "geographic_scope": ["National", "Swing State", "Other State"],
+        "campaign_phase": list(CAMPAIGN_PHASES) + ["Other"],
+        "key_event": list(KEY_EVENTS.values()),
+        "population_clean": [
+            "Likely voters",
+            "Registered voters",
+            "(All)",
+            "All adults",
+        ],
+        "methodology_clean": [
+            "Live Phone",
+            "Online",
+            "IVR/Robocall",
+            "Text/SMS",
+            "Mixed/Other",
+            "Unknown",
+        ],
+        "sample_size_category": [
+            "Small (<500)",
+            "Medium (500-999)",
+            "Large (1000-1999)",
+            "Very Large (2000+)",
+            "Unknown",
+        ],
+        "pollster_grade_category": [
+            "A-grade",
+            "B-grade",
+            "C-grade",
+            "D/F-grade",
+            "Unrated",
+        ],
+        "pollscore_category": [
+            "High Quality",
+            "Good Quality",
+            "Lower Quality",
+            "Very Low Quality",
+            "Unrated",
+        ],
+    }
+
+    # Minimum date range of the month_year / year_quarter categories
+    # (extended automatically to cover the data)
+    PERIOD_CATEGORY_RANGE = ("2020-01-01", "2025-12-31")
@@ -24,21 +24,26 @@ def load_polling_data(file_path: str) -> pd.DataFrame:
         FileNotFoundError: If file doesn't exist
         ValueError: If data format is invalid
     """
-    logger.info(f"Loading data from {file_path} ")
+    logger.info("Loading data from %s", file_path, extra={"file": file_path})
 
     try:
         df = pd.read_csv(file_path)
-        logger.info(f"Loaded {len(df):,} rows with {len(df.columns)} columns")
+        logger.info(
+            "Loaded %d rows with %d columns",
+            len(df),
+            len(df.columns),
+            extra={"stage": "load", "rows": len(df), "columns": len(df.columns)},
+        )
 
         # Basic validation
         validate_raw_data(df)
         return df
 
     except FileNotFoundError:
-        logger.error(f"File not found: {file_path}")
+        logger.error("File not found: %s", file_path)
         raise
     except Exception as e:
-        logger.error(f"Failed to load data: {e}")
+        logger.error("Failed to load data: %s", e)
         raise ValueError(f"Invalid data format: {e}")
 
 
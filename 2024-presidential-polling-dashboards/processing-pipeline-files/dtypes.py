@@ -0,0 +1,81 @@
+"""
+Compact Column Types
+====================
+
+Helpers that give derived features compact dtypes:
+- Low-cardinality labels become ordered Categoricals with a fixed category
+  list from Config (period labels also cover the data's own date range);
+  labels outside the list are reported with a warning
+- Integer features are downcast to the smallest integer type that fits
+"""
+
+import pandas as pd
+import numpy as np
+import logging
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def as_category(values, column: str, index=None, categories=None) -> pd.Series:
+    """
+    Convert label values to an ordered Categorical using Config categories.
+
+    Values not in the category list become missing and are reported with a
+    warning; add new labels to Config.CATEGORY_ORDERS to keep them.
+
+    Args:
+        values: Labels (Series, array or list)
+        column: Column name used to look up the category order
+        index: Index for the result (defaults to the values' own index)
+        categories: Explicit category list (defaults to Config.CATEGORY_ORDERS)
+
+    Returns:
+        Categorical Series
+    """
+    if categories is None:
+        categories = Config.CATEGORY_ORDERS[column]
+    if index is None and isinstance(values, pd.Series):
+        index = values.index
+
+    result = pd.Series(
+        pd.Categorical(values, categories=categories, ordered=True), index=index
+    )
+
+    # Cheap check, always on: unmapped labels would otherwise vanish silently
+    unmapped = pd.Series(values, index=result.index).notna() & result.isna()
+    if unmapped.any():
+        logger.warning(
+            "%d values of %s are not in its category list and were set to missing",
+            unmapped.sum(),
+            column,
+            extra={"stage": "compact_dtypes", "rows": int(unmapped.sum())},
+        )
+
+    return result
+
+
+def period_categories(dates: pd.Series, freq: str) -> list:
+    """
+    Period labels ("2024-07", "2024Q3", ...) spanning
+    Config.PERIOD_CATEGORY_RANGE, extended to cover every date in the data
+    so new cycles never fall outside the list.
+    """
+    start, end = (pd.Timestamp(bound) for bound in Config.PERIOD_CATEGORY_RANGE)
+    if dates.notna().any():
+        start = min(start, dates.min())
+        end = max(end, dates.max())
+    return pd.period_range(start, end, freq=freq).astype(str).tolist()
+
+
+def downcast_integers(values: pd.Series) -> pd.Series:
+    """
+    Downcast an integer-valued feature to the smallest type that fits.
+
+    Columns with missing values use the matching nullable integer type.
+    """
+    if values.isna().any():
+        downcast = pd.to_numeric(values.dropna(), downcast="integer")
+        nullable = pd.api.types.pandas_dtype(downcast.dtype.name.capitalize())
+        return values.astype(nullable)
+    return pd.to_numeric(values.astype(np.int64), downcast="integer")
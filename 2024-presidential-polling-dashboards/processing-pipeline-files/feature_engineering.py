@@ -8,6 +8,7 @@ import numpy as np
 import scipy.stats as stats
 import logging
 from config import Config
+from dtypes import as_category, downcast_integers, period_categories
 
 logger = logging.getLogger(__name__)
 
@@ -16,23 +17,31 @@ _logged_methodologies = set()
 
 def add_geographic_features(df: pd.DataFrame) -> pd.DataFrame:
     """Add geographic classification features."""
-    logger.info("Adding geographic features")
+    logger.info(
+        "Adding geographic features",
+        extra={"stage": "geographic_features", "rows": len(df)},
+    )
     df = df.copy()
 
     # Debug: Show data quality
-    missing_states = df["state"].isnull().sum()
-    logger.debug(
-        f"Missing state values: {missing_states:,} ({missing_states/len(df)*100:.1f}%)"
+    if logger.isEnabledFor(logging.DEBUG):
+        missing_states = df["state"].isnull().sum()
+        logger.debug(
+            "Missing state values: %d (%.1f%%)",
+            missing_states,
+            missing_states / len(df) * 100,
+        )
+
+    df["geographic_scope"] = as_category(
+        df["state"].apply(_classify_geographic_scope), "geographic_scope"
     )
 
-    df["geographic_scope"] = df["state"].apply(_classify_geographic_scope)
-
     # Debug: Show categorization results
     if logger.isEnabledFor(logging.DEBUG):
         geo_counts = df["geographic_scope"].value_counts()
         logger.debug("Geographic scope distribution:")
         for scope, count in geo_counts.items():
-            logger.debug(f"  {scope}: {count:,} polls")
+            logger.debug("  %s: %d polls", scope, count)
 
     return df
 
@@ -48,33 +57,53 @@ def _classify_geographic_scope(state_value):
 
 def add_temporal_features(df: pd.DataFrame) -> pd.DataFrame:
     """Add comprehensive temporal features."""
-    logger.info("Adding temporal features")
+    logger.info(
+        "Adding temporal features",
+        extra={"stage": "temporal_features", "rows": len(df)},
+    )
 
     df = df.copy()
 
     # Basic date components
-    df["year"] = df["end_date"].dt.year
-    df["month"] = df["end_date"].dt.month
-    df["quarter"] = df["end_date"].dt.quarter
-    df["week_of_year"] = df["end_date"].dt.isocalendar().week
+    df["year"] = downcast_integers(df["end_date"].dt.year)
+    df["month"] = downcast_integers(df["end_date"].dt.month)
+    df["quarter"] = downcast_integers(df["end_date"].dt.quarter)
+    df["week_of_year"] = downcast_integers(df["end_date"].dt.isocalendar().week)
 
     # Date strings for Tableau
-    df["month_year"] = df["end_date"].dt.to_period("M").astype(str)
-    df["year_quarter"] = df["end_date"].dt.to_period("Q").astype(str)
+    df["month_year"] = as_category(
+        df["end_date"].dt.to_period("M").astype(str).where(df["end_date"].notna()),
+        "month_year",
+        categories=period_categories(df["end_date"], "M"),
+    )
+    df["year_quarter"] = as_category(
+        df["end_date"].dt.to_period("Q").astype(str).where(df["end_date"].notna()),
+        "year_quarter",
+        categories=period_categories(df["end_date"], "Q"),
+    )
 
     # Campaign-specific metrics
     # More explicit for Pylance
     end_date_dt = pd.to_datetime(df["end_date"])
-    df["days_until_election"] = (Config.ELECTION_DATE - end_date_dt).dt.days
-    df["weeks_until_election"] = df["days_until_election"] / 7.0
-    df["days_since_harris_entry"] = (end_date_dt - Config.HARRIS_ENTRY_DATE).dt.days
-    df["days_from_first_debate"] = (end_date_dt - Config.FIRST_DEBATE_DATE).dt.days
+    days_until_election = (Config.ELECTION_DATE - end_date_dt).dt.days
+    df["days_until_election"] = downcast_integers(days_until_election)
+    df["weeks_until_election"] = (days_until_election / 7.0).astype(np.float32)
+    df["days_since_harris_entry"] = downcast_integers(
+        (end_date_dt - Config.HARRIS_ENTRY_DATE).dt.days
+    )
+    df["days_from_first_debate"] = downcast_integers(
+        (end_date_dt - Config.FIRST_DEBATE_DATE).dt.days
+    )
 
     # Campaign phases
-    df["campaign_phase"] = df["end_date"].apply(_get_campaign_phase)
+    df["campaign_phase"] = as_category(
+        df["end_date"].apply(_get_campaign_phase), "campaign_phase"
+    )
 
     # Key events
-    df["key_event"] = df["end_date"].dt.strftime("%Y-%m-%d").map(Config.KEY_EVENTS)
+    df["key_event"] = as_category(
+        df["end_date"].dt.strftime("%Y-%m-%d").map(Config.KEY_EVENTS), "key_event"
+    )
     df["has_key_event"] = df["key_event"].notna()
 
     return df
@@ -90,7 +119,10 @@ def _get_campaign_phase(date):
 
 def add_methodology_features(df: pd.DataFrame) -> pd.DataFrame:
     """Add methodology and poll type features."""
-    logger.info("Adding methodology features")
+    logger.info(
+        "Adding methodology features",
+        extra={"stage": "methodology_features", "rows": len(df)},
+    )
 
     df = df.copy()
 
@@ -103,15 +135,19 @@ def add_methodology_features(df: pd.DataFrame) -> pd.DataFrame:
         "v": "(All)",
     }
 
-    df["population_clean"] = df["population"].str.lower().map(population_mapping)
-    df["population_clean"] = df["population_clean"].fillna("All adults")
+    population_clean = df["population"].str.lower().map(population_mapping)
+    df["population_clean"] = as_category(
+        population_clean.fillna("All adults"), "population_clean"
+    )
 
     # Methodology cleaning
-    df["methodology_clean"] = df["methodology"].apply(_clean_methodology)
+    df["methodology_clean"] = as_category(
+        df["methodology"].apply(_clean_methodology), "methodology_clean"
+    )
 
     # Polling period
-    df["polling_period_days"] = (df["end_date"] - df["start_date"]).dt.days
-    df["polling_period_days"] = df["polling_period_days"].fillna(1).astype(int)
+    polling_period_days = (df["end_date"] - df["start_date"]).dt.days
+    df["polling_period_days"] = downcast_integers(polling_period_days.fillna(1))
 
     # Boolean flags
     df["is_tracking_poll"] = (
@@ -149,11 +185,11 @@ def _clean_methodology(method):
     ivr_keywords = ["ivr", "robo", "automated", "auto", "interactive"]
     text_keywords = ["text", "sms"]
 
-    # Check if unrecognized and log once
-    all_keywords = phone_keywords + online_keywords + ivr_keywords + text_keywords
-    if not any(keyword in method_str for keyword in all_keywords):
-        if method not in _logged_methodologies:
-            logger.debug(f"Unrecognized methodology: '{method}' -> 'Mixed/Other'")
+    # Check if unrecognized and log once (keyword scan only runs for debug)
+    if method not in _logged_methodologies and logger.isEnabledFor(logging.DEBUG):
+        all_keywords = phone_keywords + online_keywords + ivr_keywords + text_keywords
+        if not any(keyword in method_str for keyword in all_keywords):
+            logger.debug("Unrecognized methodology: '%s' -> 'Mixed/Other'", method)
             _logged_methodologies.add(method)
 
     if "live" in method or "phone" in method:
@@ -170,28 +206,39 @@ def _clean_methodology(method):
 
 def add_quality_metrics(df: pd.DataFrame) -> pd.DataFrame:
     """Add comprehensive quality metrics."""
-    logger.info("Adding quality metrics")
+    logger.info(
+        "Adding quality metrics", extra={"stage": "quality_metrics", "rows": len(df)}
+    )
 
     df = df.copy()
 
     # Debug: Sample size insights
-    logger.debug(
-        f"Sample size range: {df['sample_size'].min():,.0f} to {df['sample_size'].max():,.0f}"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Sample size range: %.0f to %.0f",
+            df["sample_size"].min(),
+            df["sample_size"].max(),
+        )
 
     # Sample size categories
-    df["sample_size_category"] = df["sample_size"].apply(_categorize_sample_size)
+    df["sample_size_category"] = as_category(
+        df["sample_size"].apply(_categorize_sample_size), "sample_size_category"
+    )
 
     # Debug: Show sample size distribution
     if logger.isEnabledFor(logging.DEBUG):
         size_counts = df["sample_size_category"].value_counts()
         logger.debug("Sample size categories:")
         for category, count in size_counts.items():
-            logger.debug(f"  {category}: {count:,} polls")
+            logger.debug("  %s: %d polls", category, count)
 
     # Grade categories
-    df["pollster_grade_category"] = df["numeric_grade"].apply(_categorize_grade)
-    df["pollscore_category"] = df["pollscore"].apply(_categorize_pollscore)
+    df["pollster_grade_category"] = as_category(
+        df["numeric_grade"].apply(_categorize_grade), "pollster_grade_category"
+    )
+    df["pollscore_category"] = as_category(
+        df["pollscore"].apply(_categorize_pollscore), "pollscore_category"
+    )
 
     # Default worst-case MOE
     df["margin_of_error"] = df["sample_size"].apply(_calculate_margin_of_error)
@@ -248,7 +295,7 @@ def _categorize_pollscore(score):
 
     # Debug: Log unusual scores
     if score < -3 or score > 3:
-        logger.debug(f"Unusual pollscore detected: {score}")
+        logger.debug("Unusual pollscore detected: %s", score)
 
     elif score <= -1:
         return "High Quality"
@@ -0,0 +1,224 @@
+"""
+Head-to-Head Margins per Poll Question
+======================================
+
+Each row of the polling data is one candidate's share in one poll
+question. Instead of self-joining the frame, rows are sorted once by
+(question, pct descending) and every question is handled as a
+contiguous block located by its group offset, so margins are computed
+in linear time after the sort.
+
+The pipeline runs this stage after filter_main_candidates, so "leader"
+and "runner-up" are the top two of Config.MAIN_CANDIDATES in each
+question, not necessarily the question's actual leader.
+"""
+
+import pandas as pd
+import numpy as np
+import logging
+import re
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def add_head_to_head_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add per-row margins against the question leader and named opponents.
+
+    Adds:
+        margin_vs_leader: pct minus the leader's pct (for the leader,
+            its lead over the runner-up)
+        margin_vs_<candidate>: pct minus that candidate's pct in the same
+            question, for each of Config.HEAD_TO_HEAD_CANDIDATES
+        two_party_total: top DEM pct + top REP pct in the question
+        two_party_pct: pct normalized to the two-party total (DEM/REP rows)
+
+    Args:
+        df: DataFrame with candidate_name, pct and question identity columns
+
+    Returns:
+        DataFrame with head-to-head margin columns
+    """
+    logger.info(
+        "Adding head-to-head margin features",
+        extra={"stage": "head_to_head", "rows": len(df)},
+    )
+    df = df.copy()
+
+    groups = _group_questions(df)
+    if groups is None:
+        return df
+
+    codes = groups["codes"]
+    pct = groups["pct"]
+    names = df["candidate_name"].to_numpy()
+
+    # Leader / runner-up are the first two rows of each sorted block
+    is_leader = np.zeros(len(df), dtype=bool)
+    is_leader[groups["order"][groups["starts"]]] = True
+    opponent = np.where(
+        is_leader, groups["runner_up_pct"][codes], groups["leader_pct"][codes]
+    )
+    df["margin_vs_leader"] = pct - opponent
+
+    for candidate in Config.HEAD_TO_HEAD_CANDIDATES:
+        candidate_pct = _candidate_pct_by_question(groups, names, candidate)
+        margin = pct - candidate_pct[codes]
+        margin[names == candidate] = np.nan
+        df[f"margin_vs_{_column_slug(candidate)}"] = margin
+
+    party = groups["party"]
+    total = groups["dem_pct"] + groups["rep_pct"]
+    df["two_party_total"] = total[codes]
+    in_two_party = np.isin(party, ["DEM", "REP"])
+    df["two_party_pct"] = np.where(in_two_party, pct / total[codes] * 100, np.nan)
+
+    logger.debug("Computed margins for %d poll questions", len(groups["starts"]))
+
+    return df
+
+
+def build_head_to_head_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build a wide table with one row per poll question.
+
+    Args:
+        df: DataFrame with candidate_name, pct and question identity columns
+
+    Returns:
+        Question table with identity and context columns (pollster, dates,
+        state, ...), leader, runner-up, lead margin, each named candidate's
+        pct and the two-party shares
+    """
+    logger.info("Building head-to-head question table")
+
+    groups = _group_questions(df)
+    if groups is None:
+        return pd.DataFrame(columns=_question_columns(df) + _table_value_columns())
+
+    names = df["candidate_name"].to_numpy()
+    order, starts, sizes = groups["order"], groups["starts"], groups["sizes"]
+    first_rows = order[starts]
+
+    # Runner-up row is the second row of the block when the block has one
+    has_runner_up = sizes > 1
+    runner_up_names = np.full(len(starts), None, dtype=object)
+    runner_up_names[has_runner_up] = names[order[starts[has_runner_up] + 1]]
+
+    table = df.iloc[first_rows][_question_columns(df)].reset_index(drop=True)
+    table["n_candidates"] = sizes
+    table["leader"] = names[first_rows]
+    table["leader_pct"] = groups["leader_pct"]
+    table["runner_up"] = runner_up_names
+    table["runner_up_pct"] = groups["runner_up_pct"]
+    table["lead_margin"] = groups["leader_pct"] - groups["runner_up_pct"]
+
+    for candidate in Config.HEAD_TO_HEAD_CANDIDATES:
+        table[f"pct_{_column_slug(candidate)}"] = _candidate_pct_by_question(
+            groups, names, candidate
+        )
+
+    total = groups["dem_pct"] + groups["rep_pct"]
+    table["two_party_total"] = total
+    table["dem_two_party_pct"] = groups["dem_pct"] / total * 100
+    table["rep_two_party_pct"] = groups["rep_pct"] / total * 100
+
+    return table[_question_columns(df) + _table_value_columns()]
+
+
+def _group_questions(df):
+    """
+    Sort rows once by question then pct (descending) and locate each
+    question block. Per-question arrays are indexed by question code.
+    Returns None for an empty frame.
+    """
+    if df.empty:
+        return None
+
+    key_columns = _question_key_columns(df)
+
+    codes = df.groupby(key_columns, sort=False, dropna=False, observed=True).ngroup()
+    codes = codes.to_numpy()
+    pct = df["pct"].to_numpy(dtype=float)
+
+    # Missing pct sorts last within its question
+    order = np.lexsort((-np.nan_to_num(pct, nan=-np.inf), codes))
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    sizes = np.diff(np.r_[starts, len(order)])
+
+    sorted_pct = pct[order]
+    leader_pct = sorted_pct[starts]
+    runner_up_pct = np.full(len(starts), np.nan)
+    runner_up_pct[sizes > 1] = sorted_pct[starts[sizes > 1] + 1]
+
+    if "party" in df.columns:
+        party = df["party"].to_numpy(dtype=object)
+    else:
+        party = (
+            df["candidate_name"].map(Config.CANDIDATE_PARTIES).to_numpy(dtype=object)
+        )
+
+    return {
+        "codes": codes,
+        "pct": pct,
+        "party": party,
+        "order": order,
+        "starts": starts,
+        "sizes": sizes,
+        "leader_pct": leader_pct,
+        "runner_up_pct": runner_up_pct,
+        "dem_pct": _top_pct_by_question(codes, pct, party == "DEM", len(starts)),
+        "rep_pct": _top_pct_by_question(codes, pct, party == "REP", len(starts)),
+    }
+
+
+def _question_key_columns(df):
+    """Columns identifying a poll question in this frame."""
+    key_columns = [col for col in Config.QUESTION_ID_COLUMNS if col in df.columns]
+    return key_columns or Config.QUESTION_FALLBACK_COLUMNS
+
+
+def _question_columns(df):
+    """Question identity plus the context columns available in this frame."""
+    key_columns = _question_key_columns(df)
+    context = [
+        col
+        for col in Config.QUESTION_CONTEXT_COLUMNS
+        if col in df.columns and col not in key_columns
+    ]
+    return key_columns + context
+
+
+def _table_value_columns():
+    """Per-question value columns of the head-to-head table, in order."""
+    candidate_columns = [
+        f"pct_{_column_slug(candidate)}" for candidate in Config.HEAD_TO_HEAD_CANDIDATES
+    ]
+    return (
+        ["n_candidates", "leader", "leader_pct", "runner_up", "runner_up_pct"]
+        + ["lead_margin"]
+        + candidate_columns
+        + ["two_party_total", "dem_two_party_pct", "rep_two_party_pct"]
+    )
+
+
+def _top_pct_by_question(codes, pct, mask, n_questions):
+    """Highest pct among masked rows of each question (NaN if none)."""
+    top = np.full(n_questions, -np.inf)
+    np.fmax.at(top, codes[mask], pct[mask])
+    top[np.isneginf(top)] = np.nan
+    return top
+
+
+def _candidate_pct_by_question(groups, names, candidate):
+    """A named candidate's top pct in each question (NaN if absent)."""
+    return _top_pct_by_question(
+        groups["codes"], groups["pct"], names == candidate, len(groups["starts"])
+    )
+
+
+def _column_slug(name):
+    """Turn a candidate name into a column-safe suffix."""
+    return re.sub(r"[^a-z0-9]+", "_", str(name).lower()).strip("_")
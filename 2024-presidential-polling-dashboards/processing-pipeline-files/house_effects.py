@@ -0,0 +1,170 @@
+"""
+Pollster House-Effect Estimation
+================================
+
+Estimates each pollster's systematic lean per candidate by fitting
+
+    pct ~ period trend + state effect + pollster effect
+
+with a sparse design matrix and an iterative least-squares solver, so the
+fit scales to thousands of pollsters and millions of rows. The state block
+(national polls form their own "state") keeps a pollster's choice of
+states from being read as partisan lean.
+"""
+
+import pandas as pd
+import numpy as np
+import scipy.sparse as sparse
+from scipy.sparse.linalg import lsqr
+import logging
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+HOUSE_EFFECT_COLUMNS = ["pollster", "candidate_name", "house_effect", "n_polls"]
+
+
+def estimate_house_effects(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Estimate pollster house effects separately for each candidate.
+
+    Effects are centered so the poll-weighted average pollster has an
+    effect of zero; a positive value means the pollster shows the
+    candidate higher than the shared trend.
+
+    Args:
+        df: DataFrame with candidate_name, pollster, end_date and pct
+
+    Returns:
+        Effect table with one row per pollster x candidate
+    """
+    logger.info(
+        "Estimating pollster house effects",
+        extra={"stage": "house_effects", "rows": len(df)},
+    )
+
+    tables = []
+    for candidate, group in df.groupby("candidate_name", sort=True):
+        table = _fit_candidate_house_effects(group)
+        if table.empty:
+            continue
+        table.insert(1, "candidate_name", candidate)
+        tables.append(table)
+
+    if not tables:
+        return pd.DataFrame(columns=HOUSE_EFFECT_COLUMNS)
+
+    effects = pd.concat(tables, ignore_index=True)[HOUSE_EFFECT_COLUMNS]
+    logger.info(
+        "Estimated %d house effects for %d pollsters",
+        len(effects),
+        effects["pollster"].nunique(),
+        extra={"stage": "house_effects", "rows": len(effects)},
+    )
+    return effects
+
+
+def add_house_effects(df: pd.DataFrame, effects: pd.DataFrame) -> pd.DataFrame:
+    """
+    Attach house effects and house-effect-adjusted percentages.
+
+    Args:
+        df: DataFrame with pollster, candidate_name and pct
+        effects: Table from estimate_house_effects()
+
+    Returns:
+        DataFrame with house_effect and pct_adjusted columns
+    """
+    logger.info("Adding house-effect adjusted percentages")
+    df = df.copy()
+
+    lookup = effects.set_index(["pollster", "candidate_name"])["house_effect"]
+    row_keys = pd.MultiIndex.from_arrays([df["pollster"], df["candidate_name"]])
+
+    # Pollsters without an estimate are treated as unbiased
+    df["house_effect"] = lookup.reindex(row_keys).fillna(0.0).to_numpy()
+    df["pct_adjusted"] = (df["pct"] - df["house_effect"]).clip(lower=0, upper=100)
+
+    return df
+
+
+def _fit_candidate_house_effects(group: pd.DataFrame) -> pd.DataFrame:
+    """Fit the sparse trend + state + pollster model for a single candidate."""
+    valid = group["pct"].notna() & group["end_date"].notna() & group["pollster"].notna()
+    group = group[valid]
+    if group.empty:
+        return pd.DataFrame(columns=["pollster", "house_effect", "n_polls"])
+
+    period_codes, periods = pd.factorize(
+        group["end_date"].dt.to_period(Config.HOUSE_EFFECT_TREND_FREQ), sort=True
+    )
+    state_codes, states = pd.factorize(_state_labels(group), sort=True)
+    pollster_codes, pollsters = pd.factorize(group["pollster"], sort=True)
+
+    n_rows = len(group)
+    n_fixed = len(periods) + len(states)
+    design = _build_design_matrix(
+        [period_codes, state_codes, pollster_codes],
+        [len(periods), len(states), len(pollsters)],
+        # Scaling up the trend/state columns means LSQR's uniform damping
+        # barely shrinks them; anything confounded with them (e.g. a state
+        # polled by one pollster only) is absorbed there, not by the pollster
+        [Config.HOUSE_EFFECT_DAMPING / Config.HOUSE_EFFECT_FIXED_DAMPING] * 2 + [1.0],
+    )
+
+    # Center the response so damping shrinks effects toward the mean, not zero
+    pct = group["pct"].to_numpy(dtype=float)
+    solution, istop, iterations = lsqr(
+        design,
+        pct - pct.mean(),
+        damp=Config.HOUSE_EFFECT_DAMPING,
+        iter_lim=Config.HOUSE_EFFECT_MAX_ITER,
+    )[:3]
+    logger.debug(
+        "LSQR solved %d rows x %d params in %d iterations (stop code %d)",
+        n_rows,
+        design.shape[1],
+        iterations,
+        istop,
+    )
+
+    n_rows_per_pollster = np.bincount(pollster_codes, minlength=len(pollsters))
+    house_effect = solution[n_fixed:]
+    house_effect = house_effect - np.average(house_effect, weights=n_rows_per_pollster)
+
+    # A poll can ask several questions; count each poll once
+    poll_columns = [Config.POLL_ID_COLUMN]
+    if Config.POLL_ID_COLUMN not in group.columns:
+        poll_columns = Config.QUESTION_FALLBACK_COLUMNS
+    distinct_polls = (
+        pd.DataFrame({"pollster_code": pollster_codes}, index=group.index)
+        .join(group[poll_columns])
+        .drop_duplicates()
+    )
+    n_polls = np.bincount(distinct_polls["pollster_code"], minlength=len(pollsters))
+
+    return pd.DataFrame(
+        {"pollster": pollsters, "house_effect": house_effect, "n_polls": n_polls}
+    )
+
+
+def _build_design_matrix(block_codes, block_sizes, block_scales):
+    """
+    Build a one-hot design matrix in CSR format with one column block per
+    factor. Each block's columns take the value of its scale.
+    """
+    n_rows = len(block_codes[0])
+    offsets = np.concatenate([[0], np.cumsum(block_sizes)[:-1]])
+    rows = np.tile(np.arange(n_rows), len(block_codes))
+    cols = np.concatenate(
+        [codes + offset for codes, offset in zip(block_codes, offsets)]
+    )
+    data = np.repeat(np.asarray(block_scales, dtype=float), n_rows)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(n_rows, sum(block_sizes)))
+
+
+def _state_labels(group):
+    """State of each poll, with national polls grouped as "National"."""
+    if "state" in group.columns:
+        return group["state"].fillna("National")
+    return group["geographic_scope"].astype(str)
@@ -3,26 +3,21 @@
 # =============================================================================
 
 import logging
+import os
 import sys
 import pandas as pd
 
 # Import from our modules
+import bootstrap
 import cleaners as clean
 import data_loader as loader
 import feature_engineering as features
-
-
-def setup_logging(debug=False):
-    """Configure logging for debugging."""
-    level = logging.DEBUG if debug else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler("polling_data_pipeline.log"),
-        ],
-    )
+import head_to_head
+import house_effects as house
+import nowcast
+import pipeline_logging
+import volatility
+from config import Config
 
 
 def print_data_summary(df: pd.DataFrame, stage: str):
@@ -36,7 +31,10 @@ def print_data_summary(df: pd.DataFrame, stage: str):
 
 
 def process_polling_data(
-    input_file: str, output_file: str, debug_mode: bool = False
+    input_file: str,
+    output_file: str,
+    debug_mode: bool = False,
+    rebuild_volatility: bool = False,
 ) -> pd.DataFrame:
     """
     Complete processing pipeline from raw data to analysis-ready format.
@@ -45,6 +43,7 @@ def process_polling_data(
         input_file: Path to raw CSV
         output_file: Path for cleaned CSV output
         debug_mode: Whether to show detailed summaries
+        rebuild_volatility: Recompute volatility indicators from full history
 
     Returns:
         Processed DataFrame
@@ -78,10 +77,28 @@ def process_polling_data(
     df = features.add_methodology_features(df)
     df = features.add_quality_metrics(df)
 
+    # Head-to-head margins within each poll question
+    df = head_to_head.add_head_to_head_features(df)
+    head_to_head_table = head_to_head.build_head_to_head_table(df)
+
+    # Estimate pollster house effects and adjust percentages
+    house_effects = house.estimate_house_effects(df)
+    df = house.add_house_effects(df, house_effects)
+
+    # Daily and rolling averages with bootstrap confidence bands
+    averages = bootstrap.compute_average_bands(df)
+
+    # Daily state x candidate nowcast grid for the geographic heat map
+    state_nowcast = nowcast.build_state_nowcast(df)
+
     # Create visualization-ready dataset
     viz_columns = [
         "candidate_name",
         "pct",
+        "pct_adjusted",
+        "house_effect",
+        "margin_vs_leader",
+        "two_party_pct",
         "end_date",
         "pollster",
         "sample_size",
@@ -102,20 +119,32 @@ def process_polling_data(
     # Create streamlined version
     df_viz = df[viz_columns]
 
-    # Calculate optimization metrics
-    original_memory_mb = df.memory_usage(deep=True).sum() / 1024**2
-    optimized_memory_mb = df_viz.memory_usage(deep=True).sum() / 1024**2
-    reduction_percent = (
-        (original_memory_mb - optimized_memory_mb) / original_memory_mb
-    ) * 100
-
-    # Log the optimization
-    logger.info("Creating visualization-ready dataset")
-    logger.info(f"Optimized from {len(df.columns)} to {len(df_viz.columns)} columns")
     logger.info(
-        f"Memory reduced from {original_memory_mb:.1f}MB to {optimized_memory_mb:.1f}MB ({reduction_percent:.1f}% smaller)"
+        "Creating visualization-ready dataset",
+        extra={"stage": "viz_dataset", "rows": len(df_viz)},
+    )
+    logger.info(
+        "Optimized from %d to %d columns",
+        len(df.columns),
+        len(df_viz.columns),
+        extra={"stage": "viz_dataset", "columns": len(df_viz.columns)},
     )
 
+    # Deep memory measurement scans every object column; only pay for it
+    # when someone will see the result
+    if debug_mode or logger.isEnabledFor(logging.DEBUG):
+        original_memory_mb = df.memory_usage(deep=True).sum() / 1024**2
+        optimized_memory_mb = df_viz.memory_usage(deep=True).sum() / 1024**2
+        reduction_percent = (
+            (original_memory_mb - optimized_memory_mb) / original_memory_mb
+        ) * 100
+        logger.debug(
+            "Memory reduced from %.1fMB to %.1fMB (%.1f%% smaller)",
+            original_memory_mb,
+            optimized_memory_mb,
+            reduction_percent,
+        )
+
     if debug_mode:
         print(f"\n{'='*20}")
         print(f"DATASET OPTIMIZATION")
@@ -128,7 +157,55 @@ def process_polling_data(
 
     # Save the streamlined dataset
     df_viz.to_csv(output_file, index=False)
-    logger.info(f"Tableau-ready dataset saved to {output_file}")
+    logger.info(
+        "Tableau-ready dataset saved to %s", output_file, extra={"file": output_file}
+    )
+
+    # Save the per-pollster house-effect table alongside it
+    output_dir = os.path.dirname(output_file)
+    house_effects_file = os.path.join(output_dir, "pollster_house_effects.csv")
+    house_effects.to_csv(house_effects_file, index=False)
+    logger.info(
+        "Pollster house effects saved to %s",
+        house_effects_file,
+        extra={"file": house_effects_file},
+    )
+
+    head_to_head_file = os.path.join(output_dir, "head_to_head_margins.csv")
+    head_to_head_table.to_csv(head_to_head_file, index=False)
+    logger.info(
+        "Head-to-head question table saved to %s",
+        head_to_head_file,
+        extra={"file": head_to_head_file},
+    )
+
+    averages_file = os.path.join(output_dir, "candidate_averages.csv")
+    averages.to_csv(averages_file, index=False)
+    logger.info(
+        "Candidate averages with confidence bands saved to %s",
+        averages_file,
+        extra={"file": averages_file},
+    )
+
+    state_nowcast_file = os.path.join(output_dir, "state_nowcast.csv")
+    state_nowcast.to_csv(
+        state_nowcast_file,
+        index=False,
+        float_format=f"%.{Config.NOWCAST_DECIMALS}f",
+    )
+    logger.info(
+        "State nowcast grid saved to %s",
+        state_nowcast_file,
+        extra={"file": state_nowcast_file},
+    )
+
+    # Incrementally update volatility indicators with newly arriving polls
+    volatility.update_volatility_indicators(
+        df,
+        state_file=os.path.join(output_dir, "volatility_state.json"),
+        output_file=os.path.join(output_dir, "polling_volatility.csv"),
+        rebuild=rebuild_volatility,
+    )
 
     if debug_mode:
         print(f"\nTableau-ready dataset saved: {output_file}")
@@ -140,37 +217,29 @@ def process_polling_data(
 def main():
     """Main entry point."""
 
-    # Parse command line arguments more robustly
-    if len(sys.argv) == 1:
-        # No additional arguments - use defaults
-        input_file = "../data/president_polls.csv"  # Default
-        debug_mode = False
-        print("Using default settings...")
-    elif len(sys.argv) == 2:
-        if sys.argv[1] == "--debug":
-            # Just --debug flag, use default file
-            input_file = "../data/president_polls.csv"
-            debug_mode = True
-        else:
-            # Just filename, normal mode
-            input_file = sys.argv[1]
-            debug_mode = False
-    elif len(sys.argv) == 3:
-        # Filename + flag
-        input_file = sys.argv[1]
-        if sys.argv[2] == "--debug":
-            debug_mode = True
-        else:
-            print(f"Unknown flag: {sys.argv[2]}")
+    # Parse command line arguments: optional input file plus flags
+    flags = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+
+    for flag in flags:
+        if flag not in ("--debug", "--rebuild-volatility"):
+            print(f"Unknown flag: {flag}")
             sys.exit(1)
-    else:
-        print("Usage: python main.py [input_file] [--debug]")
+
+    if len(positional) > 1:
+        print("Usage: python main.py [input_file] [--debug] [--rebuild-volatility]")
         sys.exit(1)
 
+    input_file = positional[0] if positional else "../data/president_polls.csv"
+    debug_mode = "--debug" in flags
+    rebuild_volatility = "--rebuild-volatility" in flags
+    if not sys.argv[1:]:
+        print("Using default settings...")
+
     output_file = "../data/cleaned_polling_data.csv"  # Can change for different vizzes
 
     # Setup logging
-    setup_logging(debug=debug_mode)
+    pipeline_logging.setup_logging(debug=debug_mode)
 
     # Show what we're doing
     print("POLLING DATA PROCESSING PIPELINE")
@@ -184,7 +253,9 @@ def main():
 
     try:
         # Run the complete pipeline
-        result_df = process_polling_data(input_file, output_file, debug_mode)
+        result_df = process_polling_data(
+            input_file, output_file, debug_mode, rebuild_volatility
+        )
 
         # Success summary
         print(f"\nSUCCESS!")
@@ -0,0 +1,106 @@
+"""
+State x Candidate Nowcast Grid
+==============================
+
+Builds a dense day x state x candidate grid of exponentially time-decayed,
+sample-size-weighted polling averages for the geographic heat map.
+
+Weighted pct sums and weights are accumulated into 3-D NumPy arrays and
+run through a first-order recursive filter along the day axis:
+
+    S[t] = decay * S[t-1] + sum(w * pct on day t)
+    W[t] = decay * W[t-1] + sum(w on day t)
+
+The nowcast is S / W. On days without polls both terms decay by the same
+factor, so the previous average carries forward automatically.
+"""
+
+import pandas as pd
+import numpy as np
+from scipy.signal import lfilter
+import logging
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def build_state_nowcast(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the daily state x candidate nowcast grid.
+
+    Args:
+        df: DataFrame with end_date, state, candidate_name, pct, sample_size
+
+    Returns:
+        Long, compact grid (categorical keys, float32 values) with one row
+        per day x state x candidate from each series' first poll onward
+    """
+    logger.info(
+        "Building state x candidate nowcast grid",
+        extra={"stage": "state_nowcast", "rows": len(df)},
+    )
+
+    data = df[df["pct"].notna() & df["end_date"].notna()]
+    if data.empty:
+        return pd.DataFrame(
+            columns=["date", "state", "candidate_name", "nowcast_pct"]
+            + ["effective_sample_size", "days_since_poll"]
+        )
+
+    dates = data["end_date"].dt.normalize()
+    states = data["state"].fillna(Config.NOWCAST_NATIONAL_LABEL)
+    state_codes, state_labels = pd.factorize(states, sort=True)
+    candidate_codes, candidate_labels = pd.factorize(data["candidate_name"], sort=True)
+    first_day = dates.min()
+    day_codes = (dates - first_day).dt.days.to_numpy()
+    n_days = day_codes.max() + 1
+
+    # Unknown sample sizes get the typical poll's weight
+    weights = data["sample_size"].astype(float)
+    weights = weights.fillna(weights.median()).fillna(1.0).to_numpy()
+    pct = data["pct"].to_numpy(dtype=float)
+
+    shape = (n_days, len(state_labels), len(candidate_labels))
+    index = (day_codes, state_codes, candidate_codes)
+    weighted_pct = np.zeros(shape)
+    weight = np.zeros(shape)
+    np.add.at(weighted_pct, index, weights * pct)
+    np.add.at(weight, index, weights)
+
+    last_poll_day = np.where(weight > 0, np.arange(n_days)[:, None, None], -1)
+    last_poll_day = np.maximum.accumulate(last_poll_day, axis=0)
+
+    # Recursive exponential decay along the day axis
+    decay = 0.5 ** (1 / Config.NOWCAST_HALF_LIFE_DAYS)
+    weighted_pct = lfilter([1.0], [1.0, -decay], weighted_pct, axis=0)
+    weight = lfilter([1.0], [1.0, -decay], weight, axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        nowcast = weighted_pct / weight
+
+    # Keep cells from each series' first poll onward
+    observed = last_poll_day >= 0
+    days, state_idx, candidate_idx = np.nonzero(observed)
+
+    grid = pd.DataFrame(
+        {
+            "date": first_day + pd.to_timedelta(days, unit="D"),
+            "state": pd.Categorical.from_codes(state_idx, state_labels),
+            "candidate_name": pd.Categorical.from_codes(
+                candidate_idx, candidate_labels
+            ),
+            "nowcast_pct": nowcast[observed].astype(np.float32),
+            "effective_sample_size": weight[observed].astype(np.float32),
+            "days_since_poll": (days - last_poll_day[observed]).astype(np.int16),
+        }
+    )
+
+    logger.info(
+        "Nowcast grid: %d days x %d states x %d candidates (%d rows)",
+        n_days,
+        len(state_labels),
+        len(candidate_labels),
+        len(grid),
+        extra={"stage": "state_nowcast", "rows": len(grid)},
+    )
+    return grid
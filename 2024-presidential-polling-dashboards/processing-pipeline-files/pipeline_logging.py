@@ -0,0 +1,110 @@
+"""
+Non-Blocking Structured Logging
+===============================
+
+Pipeline code only puts log records on an in-memory queue; a background
+QueueListener thread formats them and does the stdout/file I/O.
+
+- Messages use lazy %-style arguments, so they are only formatted by the
+  listener, and only for records that pass the level check.
+- The log file gets one JSON object per line with the stage/row-count
+  fields passed through `extra=`, for monitoring.
+- stdout keeps the human-readable format.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FILE = "polling_data_pipeline.log"
+CONSOLE_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Optional structured fields callers can attach with extra={...}
+STRUCTURED_FIELDS = ("stage", "rows", "columns", "file")
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            if hasattr(record, field):
+                payload[field] = getattr(record, field)
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=_json_default)
+
+
+def _json_default(value):
+    """Serialize NumPy scalars as plain numbers and anything else as text."""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that skips the caller-side formatting done by the stdlib
+    prepare(), leaving all formatting to the listener thread. Log
+    arguments must therefore not be mutated after the logging call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(debug: bool = False, log_file: str = LOG_FILE) -> QueueListener:
+    """
+    Route all logging through a queue to a background writer thread.
+
+    Args:
+        debug: Enable DEBUG level (default INFO)
+        log_file: Path for the JSON-lines log file
+
+    Returns:
+        The running QueueListener (stopped automatically at exit)
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(log_queue))
+    root.setLevel(logging.DEBUG if debug else logging.INFO)
+
+    _listener = QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
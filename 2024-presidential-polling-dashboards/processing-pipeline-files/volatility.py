@@ -0,0 +1,291 @@
+"""
+Polling Volatility Indicators
+=============================
+
+Tracks rolling standard deviation of poll results over time per
+candidate x geographic scope x window with running mean/variance
+(Welford) state, instead of rescanning history on every refresh.
+
+Polls are usually published days after fieldwork ends, so a refresh
+cannot just process polls newer than the last end date it saw. The
+persisted state is a checkpoint taken VOLATILITY_LOOKBACK_DAYS before the
+latest poll, together with the CSV byte offset where later rows start.
+Each refresh restores the checkpoint, truncates the CSV there and
+replays the polls after it. Late polls inside the lookback are picked
+up, and per-refresh cost depends only on the lookback window. Polls that
+arrive later than that are reported with a warning and need a rebuild.
+
+Days are replayed in a fixed order, so a refresh and rebuild=True write
+identical files.
+"""
+
+import pandas as pd
+import numpy as np
+import json
+import logging
+import os
+from collections import deque
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+VOLATILITY_COLUMNS = [
+    "window_days",
+    "date",
+    "n_polls_window",
+    "rolling_mean",
+    "rolling_std",
+    "change_zscore",
+]
+
+
+def update_volatility_indicators(
+    df: pd.DataFrame, state_file: str, output_file: str, rebuild: bool = False
+) -> pd.DataFrame:
+    """
+    Refresh volatility indicators from the persisted checkpoint.
+
+    Args:
+        df: DataFrame with end_date, pct and the volatility group columns
+        state_file: JSON file holding the Welford checkpoint between runs
+        output_file: CSV of indicator rows; rows after the checkpoint are
+            rewritten on each refresh
+        rebuild: Ignore existing state and recompute from all polls
+
+    Returns:
+        Indicator rows written by this run (one per series x poll day)
+    """
+    if rebuild or not (os.path.exists(state_file) and os.path.exists(output_file)):
+        logger.info("Rebuilding volatility indicators from full history")
+        checkpoint = _empty_checkpoint()
+        rebuild = True
+    else:
+        checkpoint = load_volatility_state(state_file)
+
+    polls = df[df["pct"].notna() & df["end_date"].notna()]
+    dates = polls["end_date"].dt.normalize()
+    if checkpoint["date"] is not None:
+        before_checkpoint = dates <= checkpoint["date"]
+        _warn_on_checkpoint_mismatch(int(before_checkpoint.sum()), checkpoint)
+        polls = polls[~before_checkpoint]
+        dates = dates[~before_checkpoint]
+
+    logger.info(
+        "Replaying %d polls after the volatility checkpoint",
+        len(polls),
+        extra={"stage": "volatility", "rows": len(polls)},
+    )
+
+    # Next checkpoint trails the latest poll by the lookback (never moves back)
+    new_checkpoint_date = checkpoint["date"]
+    if len(polls):
+        lookback_date = dates.max() - pd.Timedelta(days=Config.VOLATILITY_LOOKBACK_DAYS)
+        if new_checkpoint_date is None or lookback_date > new_checkpoint_date:
+            new_checkpoint_date = lookback_date
+
+    indicators, checkpoint_series = advance_volatility_state(
+        checkpoint["series"], polls, new_checkpoint_date
+    )
+
+    # Rows up to the checkpoint are final; later rows are rewritten next time
+    if new_checkpoint_date is None:
+        settled = pd.Series(False, index=indicators.index)
+        settled_polls = 0
+    else:
+        settled = indicators["date"] <= new_checkpoint_date
+        settled_polls = int((dates <= new_checkpoint_date).sum())
+    with open(output_file, "w" if rebuild else "r+", newline="") as f:
+        if rebuild:
+            indicators.head(0).to_csv(f, index=False)
+        else:
+            f.seek(checkpoint["offset"])
+            f.truncate()
+        indicators[settled].to_csv(f, header=False, index=False)
+        offset = f.tell()
+        indicators[~settled].to_csv(f, header=False, index=False)
+
+    new_checkpoint = {
+        "date": new_checkpoint_date,
+        "offset": offset,
+        "n_polls": checkpoint["n_polls"] + settled_polls,
+        "series": checkpoint_series,
+    }
+    save_volatility_state(new_checkpoint, state_file)
+    logger.info(
+        "Wrote %d volatility rows to %s",
+        len(indicators),
+        output_file,
+        extra={"stage": "volatility", "rows": len(indicators), "file": output_file},
+    )
+
+    return indicators
+
+
+def advance_volatility_state(
+    series_states: dict, polls: pd.DataFrame, checkpoint_date=None
+) -> tuple:
+    """
+    Feed polls into the running series, day by day, and emit indicators.
+
+    Args:
+        series_states: Series state keyed by (group values..., window);
+            modified in place
+        polls: Polls after the current checkpoint, with end_date, pct and
+            the volatility group columns
+        checkpoint_date: Day to snapshot the series state at (None: no snapshot)
+
+    Returns:
+        (indicator rows for each series x window x poll day, copies of
+        each series' state as of the end of checkpoint_date)
+    """
+    group_columns = Config.VOLATILITY_GROUP_COLUMNS
+    output_columns = group_columns + VOLATILITY_COLUMNS
+    snapshot = {key: _copy_series(series) for key, series in series_states.items()}
+    if polls.empty:
+        return pd.DataFrame(columns=output_columns), snapshot
+
+    # Deterministic order so refreshed and rebuilt runs add values identically
+    polls = polls[group_columns + ["pct"]].assign(date=polls["end_date"].dt.normalize())
+    polls = polls.sort_values(group_columns + ["date", "pct"], kind="stable")
+
+    rows = []
+    for group_key, group in polls.groupby(group_columns, sort=False, observed=True):
+        days = [
+            (date, day["pct"].to_numpy(dtype=float))
+            for date, day in group.groupby("date", sort=True)
+        ]
+        for window in Config.VOLATILITY_WINDOWS_DAYS:
+            key = tuple(group_key) + (window,)
+            series = series_states.setdefault(key, _empty_series())
+            for date, values in days:
+                rows.append(
+                    tuple(group_key)
+                    + (window, date)
+                    + _advance_series(series, date.toordinal(), values, window)
+                )
+                if checkpoint_date is not None and date <= checkpoint_date:
+                    snapshot[key] = _copy_series(series)
+
+    # Date-major order makes refreshed files line up with a full rebuild
+    indicators = pd.DataFrame(rows, columns=output_columns)
+    indicators = indicators.sort_values(
+        ["date"] + group_columns + ["window_days"], kind="stable", ignore_index=True
+    )
+    return indicators, snapshot
+
+
+def load_volatility_state(state_file: str) -> dict:
+    """Load the persisted Welford checkpoint from JSON."""
+    with open(state_file) as f:
+        raw = json.load(f)
+
+    checkpoint = _empty_checkpoint()
+    if raw["date"] is not None:
+        checkpoint["date"] = pd.Timestamp(raw["date"])
+    checkpoint["offset"] = raw["offset"]
+    checkpoint["n_polls"] = raw["n_polls"]
+    for entry in raw["series"]:
+        checkpoint["series"][tuple(entry["key"])] = {
+            "count": entry["count"],
+            "mean": entry["mean"],
+            "m2": entry["m2"],
+            "buffer": deque(tuple(item) for item in entry["buffer"]),
+        }
+    return checkpoint
+
+
+def save_volatility_state(checkpoint: dict, state_file: str) -> None:
+    """Persist the Welford checkpoint as JSON (floats round-trip exactly)."""
+    date = checkpoint["date"]
+    raw = {
+        "date": None if date is None else date.isoformat(),
+        "offset": checkpoint["offset"],
+        "n_polls": checkpoint["n_polls"],
+        "series": [
+            {
+                "key": list(key),
+                "count": series["count"],
+                "mean": series["mean"],
+                "m2": series["m2"],
+                "buffer": [list(item) for item in series["buffer"]],
+            }
+            for key, series in checkpoint["series"].items()
+        ],
+    }
+    with open(state_file, "w") as f:
+        json.dump(raw, f)
+
+
+def _warn_on_checkpoint_mismatch(n_polls_before, checkpoint):
+    """Warn when polls at or before the checkpoint changed since it was taken."""
+    difference = n_polls_before - checkpoint["n_polls"]
+    if difference:
+        logger.warning(
+            "%d polls ending on or before the volatility checkpoint (%s) were "
+            "added or removed after it was taken and are not reflected; "
+            "rerun with --rebuild-volatility",
+            abs(difference),
+            checkpoint["date"].date(),
+            extra={"stage": "volatility", "rows": abs(difference)},
+        )
+
+
+def _empty_checkpoint():
+    return {"date": None, "offset": 0, "n_polls": 0, "series": {}}
+
+
+def _copy_series(series):
+    return dict(series, buffer=deque(series["buffer"]))
+
+
+def _empty_series():
+    return {"count": 0, "mean": 0.0, "m2": 0.0, "buffer": deque()}
+
+
+def _advance_series(series, day, values, window):
+    """
+    Move one series forward to `day`: expire old polls, score the day's
+    change against the remaining window, then add the day's polls.
+    """
+    # Drop polls that have fallen out of the trailing window
+    buffer = series["buffer"]
+    while buffer and buffer[0][0] <= day - window:
+        _welford_remove(series, buffer.popleft()[1])
+
+    # z-score of the day's mean against the window before it
+    previous_std = _sample_std(series)
+    if previous_std > 0:
+        change_zscore = (values.mean() - series["mean"]) / previous_std
+    else:
+        change_zscore = np.nan
+
+    for value in values:
+        value = float(value)
+        _welford_add(series, value)
+        buffer.append((day, value))
+
+    return series["count"], series["mean"], _sample_std(series), change_zscore
+
+
+def _welford_add(series, value):
+    series["count"] += 1
+    delta = value - series["mean"]
+    series["mean"] += delta / series["count"]
+    series["m2"] += delta * (value - series["mean"])
+
+
+def _welford_remove(series, value):
+    series["count"] -= 1
+    if series["count"] == 0:
+        series["mean"] = 0.0
+        series["m2"] = 0.0
+        return
+    delta = value - series["mean"]
+    series["mean"] -= delta / series["count"]
+    series["m2"] = max(series["m2"] - delta * (value - series["mean"]), 0.0)
+
+
+def _sample_std(series):
+    if series["count"] < 2:
+        return np.nan
+    return np.sqrt(series["m2"] / (series["count"] - 1))